@@ -10,10 +10,11 @@ from typing import Optional
 from wyoming.server import AsyncServer
 
 from . import __version__
-from .const import Settings, State
+from .const import Settings
 from .event_handler import SpeechToPhraseEventHandler
 from .hass_api import HomeAssistantInfo, get_hass_info
 from .models import DEFAULT_MODEL, Model, get_models_for_languages
+from .state import State
 from .train import train
 
 _LOGGER = logging.getLogger()
@@ -1,8 +1,6 @@
 """Constants."""
 
-import asyncio
 from collections.abc import Callable
-from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional, Union
@@ -109,33 +107,9 @@ class Settings:
         """Path to YAML file with training sentences."""
         return self.model_train_dir(model_id) / "sentences.yaml"
 
-
-@dataclass
-class CachedTranscriber:
-    """Transcription task and audio queue."""
-
-    task: asyncio.Task
-    audio_queue: "asyncio.Queue[Optional[bytes]]"
-
-
-@dataclass
-class State:
-    """Application state."""
-
-    settings: Settings
-    """Application settings."""
-
-    model_train_tasks: Dict[str, asyncio.Task] = field(default_factory=dict)
-    """Training tasks for each model id."""
-
-    model_train_tasks_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
-    """Lock for model_train_tasks."""
-
-    cached_transcribers: Dict[str, CachedTranscriber] = field(default_factory=dict)
-    """Transcription tasks/audio queues for each model id."""
-
-    cached_transcriber_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
-    """Lock for cached_transcriber."""
+    def intents_cache_path(self, model_id: str) -> Path:
+        """Path to cached intents for a model."""
+        return self.model_train_dir(model_id) / "intents.pkl"
 
 
 class WordCasing(str, Enum):
@@ -148,13 +122,18 @@ class WordCasing(str, Enum):
     @staticmethod
     def get_function(casing: "WordCasing") -> Callable[[str], str]:
         """Get a Python function to apply casing."""
-        if casing == WordCasing.LOWER:
-            return str.lower
+        return _CASING_FUNCTIONS.get(casing, _keep_casing)
+
+
+def _keep_casing(text: str) -> str:
+    return text
 
-        if casing == WordCasing.UPPER:
-            return str.upper
 
-        return lambda s: s
+_CASING_FUNCTIONS: Dict[WordCasing, Callable[[str], str]] = {
+    WordCasing.LOWER: str.lower,
+    WordCasing.UPPER: str.upper,
+    WordCasing.KEEP: _keep_casing,
+}
 
 
 class SpeechToPhraseError(Exception):
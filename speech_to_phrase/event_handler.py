@@ -15,9 +15,10 @@ from wyoming.server import AsyncEventHandler
 
 from . import __version__
 from .audio import multiply_volume, vad_audio_stream
-from .const import CHANNELS, RATE, WIDTH, CachedTranscriber, State
+from .const import CHANNELS, RATE, WIDTH
 from .hass_api import get_hass_info
 from .models import DEFAULT_MODEL, MODELS, Model
+from .state import CachedTranscriber, State
 from .train import train
 from .transcribe import transcribe
 from .util import get_language_family
@@ -1,11 +1,14 @@
 """Grapheme to phoneme methods."""
 
+import os
 import sqlite3
 import subprocess
 import tempfile
+import threading
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import regex as re
 from unicode_rbnf import RbnfEngine
@@ -19,13 +22,31 @@ _NUMBER = re.compile(r"^\d+(\.\d+)?$")
 
 
 class LexiconDatabase:
-    """Pronunciation database."""
+    """Pronunciation database.
+
+    The database is opened read-only with a separate connection for each thread.
+    """
 
     def __init__(self, db_path: Optional[Union[str, Path]] = None) -> None:
         self.db_path = Path(db_path) if db_path else None
-        self._conn = sqlite3.Connection(str(self.db_path)) if self.db_path else None
+        self._thread_local = threading.local()
         self._cache: Dict[str, Optional[List[List[str]]]] = {}
 
+    @property
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        """Get the database connection for the current thread."""
+        if self.db_path is None:
+            return None
+
+        conn: Optional[sqlite3.Connection] = getattr(self._thread_local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                f"{self.db_path.absolute().as_uri()}?mode=ro", uri=True
+            )
+            self._thread_local.conn = conn
+
+        return conn
+
     def add(self, word: str, pronunciations: List[List[str]]) -> None:
         """Add pronunciations for a word (cache only)."""
         cached_prons = self._cache.get(word)
@@ -79,6 +100,87 @@ class LexiconDatabase:
 
         return db_prons
 
+    def lookup_many(
+        self, words: Iterable[str], batch_size: int = 900
+    ) -> Dict[str, List[List[str]]]:
+        """Get pronunciations for many words with batched database queries.
+
+        Batches are queried in parallel. Words without pronunciations are left out
+        of the result.
+        """
+        words = list(words)
+        word_vars: Dict[str, List[str]] = {}
+        uncached_vars: Set[str] = set()
+        for word in words:
+            word_vars[word] = list(self._word_variations(word))
+            if any(
+                self._cache.get(word_var) is not None for word_var in word_vars[word]
+            ):
+                continue
+
+            uncached_vars.update(word_vars[word])
+
+        db_prons: Dict[str, List[List[str]]] = {}
+        if (self.db_path is not None) and uncached_vars:
+            # Stay under SQLite's limit on query parameters
+            sorted_vars = sorted(uncached_vars)
+            batches = [
+                sorted_vars[batch_start : batch_start + batch_size]
+                for batch_start in range(0, len(sorted_vars), batch_size)
+            ]
+
+            if len(batches) > 1:
+                max_workers = min(len(batches), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers) as executor:
+                    batch_rows = list(executor.map(self._select_phonemes, batches))
+            else:
+                batch_rows = [self._select_phonemes(batch) for batch in batches]
+
+            # Batches are in word order, so pronunciation order is preserved
+            for rows in batch_rows:
+                for word, phonemes in rows:
+                    db_prons.setdefault(word, []).append(phonemes.split())
+
+        prons: Dict[str, List[List[str]]] = {}
+        for word in words:
+            word_prons: Optional[List[List[str]]] = None
+            for word_var in word_vars[word]:
+                word_prons = self._cache.get(word_var)
+                if word_prons is not None:
+                    break
+
+            if word_prons is None:
+                if self.db_path is None:
+                    continue
+
+                word_prons = []
+                for word_var in word_vars[word]:
+                    word_var_prons = db_prons.get(word_var)
+                    if word_var_prons:
+                        # Only use pronunciation for first variation
+                        word_prons = word_var_prons
+                        self._cache[word_var] = word_prons
+                        break
+
+                # Update cache
+                self._cache[word] = word_prons
+
+            if word_prons:
+                prons[word] = word_prons
+
+        return prons
+
+    def _select_phonemes(self, words: List[str]) -> List[Tuple[str, str]]:
+        """Get (word, phonemes) rows for words in pronunciation order."""
+        assert self._conn is not None
+        cur = self._conn.execute(
+            "SELECT word, phonemes FROM word_phonemes "
+            f"WHERE word IN ({','.join('?' * len(words))}) "
+            "ORDER by word, pron_order",
+            words,
+        )
+        return cur.fetchall()
+
     def _word_variations(self, word: str) -> Iterable[str]:
         yield word
         word_lower = word.lower()
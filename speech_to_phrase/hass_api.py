@@ -120,10 +120,10 @@ class Things:
             for entity_hash in sorted(e.get_hash() for e in self.entities):
                 hasher.update(entity_hash.encode("utf-8"))
 
-            for area_hash in sorted(e.get_hash() for e in self.entities):
+            for area_hash in sorted(a.get_hash() for a in self.areas):
                 hasher.update(area_hash.encode("utf-8"))
 
-            for floor_hash in sorted(e.get_hash() for e in self.entities):
+            for floor_hash in sorted(f.get_hash() for f in self.floors):
                 hasher.update(floor_hash.encode("utf-8"))
 
             for trigger_sentence in sorted(self.trigger_sentences):
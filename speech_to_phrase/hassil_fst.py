@@ -68,6 +68,17 @@ class Fst:
     output_words: Set[str] = field(default_factory=set)
     start: int = 0
     current_state: int = 0
+    _sorted_words: Optional[Tuple[str, ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def sorted_words(self) -> Tuple[str, ...]:
+        """Input words in sorted order (cached until a word is added)."""
+        if self._sorted_words is None:
+            self._sorted_words = tuple(sorted(self.words))
+
+        return self._sorted_words
 
     def next_state(self) -> int:
         self.states.add(self.current_state)
@@ -107,8 +118,9 @@ class Fst:
         if (not in_label) or (not out_label):
             raise ValueError(f"Labels cannot be empty: from={in_label}, to={out_label}")
 
-        if in_label != EPS:
+        if (in_label != EPS) and (in_label not in self.words):
             self.words.add(in_label)
+            self._sorted_words = None
 
         if out_label != EPS:
             self.output_words.add(out_label)
@@ -1,12 +1,13 @@
 """Local speech tools."""
 
 import asyncio
+import contextlib
 import logging
 import os
 import shlex
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -69,21 +70,34 @@ class SpeechTools:
 
         return self._extended_env
 
-    async def async_run(self, program: str, args: List[str], **kwargs):
+    async def async_run(  # pylint: disable=redefined-builtin
+        self, program: str, args: List[str], input: Optional[bytes] = None, **kwargs
+    ):
         if "env" not in kwargs:
             kwargs["env"] = self.extended_env
 
         if "stderr" not in kwargs:
             kwargs["stderr"] = asyncio.subprocess.PIPE
 
+        if input is not None:
+            kwargs["stdin"] = asyncio.subprocess.PIPE
+
+        if "stdout" not in kwargs:
+            kwargs["stdout"] = asyncio.subprocess.PIPE
+
+        if (program == "bash") and args and os.access(args[0], os.X_OK):
+            # Run executable scripts directly (shebang selects interpreter)
+            program, args = args[0], args[1:]
+
         _LOGGER.debug("%s %s", program, args)
-        proc = await asyncio.create_subprocess_exec(
-            program,
-            *args,
-            stdout=asyncio.subprocess.PIPE,
-            **kwargs,
-        )
-        stdout, stderr = await proc.communicate()
+        proc = await asyncio.create_subprocess_exec(program, *args, **kwargs)
+        try:
+            stdout, stderr = await proc.communicate(input=input)
+        except BaseException:
+            # Don't leave the process running if cancelled
+            await _kill_processes([proc])
+            raise
+
         if proc.returncode != 0:
             error_text = f"Unexpected error running command {program} {args}"
             if stderr:
@@ -121,33 +135,137 @@ class SpeechTools:
         return stdout
 
     async def async_run_pipeline(  # pylint: disable=redefined-builtin
-        self, *commands: List[str], input: Optional[bytes] = None, **kwargs
+        self,
+        *commands: List[str],
+        input: Optional[bytes] = None,
+        input_text: Optional[Iterable[str]] = None,
+        **kwargs,
     ) -> bytes:
+        """Run commands with the output of each piped into the next.
+
+        Commands are run directly (not through a shell), so arguments must not be
+        quoted.
+
+        input_text is written to the first command from a separate thread while
+        the commands run, so it never has to be held in memory or on disk all at
+        once.
+        """
         if "env" not in kwargs:
             kwargs["env"] = self.extended_env
 
         if "stderr" not in kwargs:
             kwargs["stderr"] = asyncio.subprocess.PIPE
 
+        stdin: Any = kwargs.pop("stdin", None)
         if input is not None:
-            kwargs["stdin"] = asyncio.subprocess.PIPE
+            stdin = asyncio.subprocess.PIPE
 
         command_str = " | ".join((shlex.join(c) for c in commands))
         _LOGGER.debug(command_str)
 
-        proc = await asyncio.create_subprocess_shell(
-            command_str,
-            stdout=asyncio.subprocess.PIPE,
-            **kwargs,
-        )
-        stdout, stderr = await proc.communicate(input=input)
-        if proc.returncode != 0:
-            error_text = f"Unexpected error running command {command_str}"
-            if stderr:
-                error_text += f": {stderr.decode()}"
-            elif stdout:
-                error_text += f": {stdout.decode()}"
-
-            raise RuntimeError(error_text)
+        procs: "List[asyncio.subprocess.Process]" = []
+        pipe_read_fd: Optional[int] = None
+        input_write_fd: Optional[int] = None
+        if input_text is not None:
+            pipe_read_fd, input_write_fd = os.pipe()
+
+        try:
+            for command_idx, command in enumerate(commands):
+                next_read_fd: Optional[int] = None
+                proc_stdout: Any = asyncio.subprocess.PIPE
+                if command_idx < (len(commands) - 1):
+                    next_read_fd, proc_stdout = os.pipe()
+
+                try:
+                    proc = await asyncio.create_subprocess_exec(
+                        *command,
+                        stdin=stdin if pipe_read_fd is None else pipe_read_fd,
+                        stdout=proc_stdout,
+                        **kwargs,
+                    )
+                except BaseException:
+                    if next_read_fd is not None:
+                        os.close(next_read_fd)
+
+                    raise
+                finally:
+                    # Child processes have their own copies of the pipe ends
+                    if pipe_read_fd is not None:
+                        os.close(pipe_read_fd)
+
+                    if next_read_fd is not None:
+                        os.close(proc_stdout)
+
+                procs.append(proc)
+                pipe_read_fd = next_read_fd
+        except BaseException:
+            if input_write_fd is not None:
+                os.close(input_write_fd)
+
+            await _kill_processes(procs)
+            raise
+
+        writes: List[Any] = []
+        if (input_write_fd is not None) and (input_text is not None):
+            writes.append(
+                asyncio.get_running_loop().run_in_executor(
+                    None, _write_text, input_write_fd, input_text
+                )
+            )
+
+        # Input goes to the first process and output comes from the last.
+        # stderr is read from all processes so none of them can block.
+        try:
+            results = await asyncio.gather(
+                *(
+                    proc.communicate(input=input if proc_idx == 0 else None)
+                    for proc_idx, proc in enumerate(procs)
+                ),
+                *writes,
+            )
+        except BaseException:
+            # Don't leave processes running if cancelled
+            await _kill_processes(procs)
+            raise
+
+        results = results[: len(procs)]
+        stdout = results[-1][0]
+
+        for command, proc, (proc_stdout, proc_stderr) in zip(commands, procs, results):
+            if proc.returncode != 0:
+                # Only the last process has its stdout captured
+                error_text = (
+                    f"Unexpected error running command {shlex.join(command)} "
+                    f"(in {command_str})"
+                )
+                if proc_stderr:
+                    error_text += f": {proc_stderr.decode()}"
+                elif proc_stdout:
+                    error_text += f": {proc_stdout.decode()}"
+                else:
+                    error_text += f": exit code {proc.returncode}"
+
+                raise RuntimeError(error_text)
 
         return stdout
+
+
+async def _kill_processes(procs: "List[asyncio.subprocess.Process]") -> None:
+    """Kill processes that are still running and wait for them to exit."""
+    for proc in procs:
+        if proc.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+
+    for proc in procs:
+        await proc.wait()
+
+
+def _write_text(write_fd: int, text: Iterable[str]) -> None:
+    """Write text to a pipe and close it."""
+    try:
+        with open(write_fd, "w", encoding="utf-8") as write_file:
+            write_file.writelines(text)
+    except BrokenPipeError:
+        # Process exited early and will report its own error
+        pass
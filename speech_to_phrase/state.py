@@ -0,0 +1,35 @@
+"""Application state."""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from .const import Settings
+
+
+@dataclass
+class CachedTranscriber:
+    """Transcription task and audio queue."""
+
+    task: asyncio.Task
+    audio_queue: "asyncio.Queue[Optional[bytes]]"
+
+
+@dataclass
+class State:
+    """Application state."""
+
+    settings: Settings
+    """Application settings."""
+
+    model_train_tasks: Dict[str, asyncio.Task] = field(default_factory=dict)
+    """Training tasks for each model id."""
+
+    model_train_tasks_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    """Lock for model_train_tasks."""
+
+    cached_transcribers: Dict[str, CachedTranscriber] = field(default_factory=dict)
+    """Transcription tasks/audio queues for each model id."""
+
+    cached_transcriber_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    """Lock for cached_transcriber."""
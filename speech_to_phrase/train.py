@@ -1,9 +1,16 @@
 """Model training."""
 
+import asyncio
 import hashlib
+import io
 import json
 import logging
+import os
+import pickle
 from dataclasses import asdict, dataclass
+from importlib.metadata import version
+from pathlib import Path
+from typing import List, Optional, Tuple
 
 from hassil import Intents, merge_dict
 
@@ -15,10 +22,16 @@ from .lang_sentences import LanguageData, load_shared_lists
 from .models import Model, ModelType, download_model
 from .train_coqui_stt import train_coqui_stt
 from .train_kaldi import train_kaldi
-from .util import quote_strings, yaml, yaml_output
+from .util import load_yaml, quote_strings, yaml_output
 
 _LOGGER = logging.getLogger(__name__)
 
+try:
+    # Faster JSON if available
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 
 @dataclass
 class TrainingInfo:
@@ -41,16 +54,18 @@ async def train(
     if not model_dir.exists():
         await download_model(model, settings)
 
+    custom_sentences_paths = _get_custom_sentences_paths(model, settings)
     training_info = TrainingInfo(
         model_version=model.version,
-        sentences_hash=_get_sentences_hash(model, settings),
+        sentences_hash=await _get_sentences_hash(
+            model, settings, custom_sentences_paths
+        ),
         things_hash=things.get_hash(),
     )
 
     training_info_path = settings.model_training_info_path(model.id)
     if (not force_retrain) and training_info_path.exists():
-        with open(training_info_path, "r", encoding="utf-8") as training_info_file:
-            last_training_info = TrainingInfo(**json.load(training_info_file))
+        last_training_info = _read_training_info(training_info_path)
 
         if last_training_info == training_info:
             _LOGGER.debug("Skipping training of %s", model.id)
@@ -63,8 +78,24 @@ async def train(
     # Written at the end of training
     training_info_path.unlink(missing_ok=True)
 
-    # Create intents
-    intents = _create_intents(model, settings, things)
+    # Create intents (cached by sentences and things)
+    intents_cache_path = settings.intents_cache_path(model.id)
+    intents_cache_key = _get_intents_cache_key(settings, things, training_info)
+    cached_intents = _load_cached_intents(intents_cache_path, intents_cache_key)
+    if cached_intents is None:
+        intents, training_sentences_yaml = _create_intents(
+            model, settings, things, custom_sentences_paths
+        )
+        _save_cached_intents(
+            intents_cache_path, intents_cache_key, intents, training_sentences_yaml
+        )
+    else:
+        intents, training_sentences_yaml = cached_intents
+
+    # Write YAML with training sentences (includes HA lists, triggers, etc.)
+    training_sentences_path = settings.training_sentences_path(model.id)
+    training_sentences_path.write_text(training_sentences_yaml, encoding="utf-8")
+    _LOGGER.debug("Wrote debug YAML to %s", training_sentences_path)
 
     if model.type == ModelType.KALDI:
         lexicon = LexiconDatabase(settings.models_dir / model.id / "lexicon.db")
@@ -78,11 +109,7 @@ async def train(
         raise TrainingError(f"Unexpected model type for {model.id}: {model.type}")
 
     # Write training info
-    with open(training_info_path, "w", encoding="utf-8") as training_info_file:
-        json.dump(
-            asdict(training_info),
-            training_info_file,
-        )
+    _write_training_info(training_info_path, training_info)
 
     _LOGGER.info("Finished training: %s", model.id)
 
@@ -90,18 +117,44 @@ async def train(
 # -----------------------------------------------------------------------------
 
 
-def _create_intents(model: Model, settings: Settings, things: Things) -> Intents:
-    """Create intents from sentences and things from Home Assistant."""
+def _read_training_info(training_info_path: Path) -> TrainingInfo:
+    """Read training info from a JSON file."""
+    training_info_bytes = training_info_path.read_bytes()
+    if orjson is not None:
+        return TrainingInfo(**orjson.loads(training_info_bytes))
+
+    return TrainingInfo(**json.loads(training_info_bytes))
+
+
+def _write_training_info(training_info_path: Path, training_info: TrainingInfo) -> None:
+    """Write training info to a JSON file."""
+    if orjson is not None:
+        training_info_path.write_bytes(orjson.dumps(asdict(training_info)))
+        return
+
+    training_info_path.write_text(json.dumps(asdict(training_info)), encoding="utf-8")
+
+
+def _create_intents(
+    model: Model,
+    settings: Settings,
+    things: Things,
+    custom_sentences_paths: List[Path],
+) -> Tuple[Intents, str]:
+    """Create intents from sentences and things from Home Assistant.
+
+    Returns the intents and debug YAML with the training sentences.
+    """
     sentences_path = settings.sentences / f"{model.sentences_language}.yaml"
     with open(sentences_path, "r", encoding="utf-8") as sentences_file:
-        lang_data = LanguageData.from_dict(yaml.load(sentences_file))
+        lang_data = LanguageData.from_dict(load_yaml(sentences_file))
         sentences_dict = lang_data.to_intents_dict()
 
     lists_dict = sentences_dict.get("lists", {})
     lists_dict.update(things.to_lists_dict())
 
     with open(settings.shared_lists_path, "r", encoding="utf-8") as shared_lists_file:
-        shared_lists_dict = load_shared_lists(yaml.load(shared_lists_file))
+        shared_lists_dict = load_shared_lists(load_yaml(shared_lists_file))
         lists_dict.update(shared_lists_dict)
 
     sentences_dict["lists"] = lists_dict
@@ -115,22 +168,13 @@ def _create_intents(model: Model, settings: Settings, things: Things) -> Intents
         sentences_dict["intents"] = intents_dict
 
     # Custom sentences
-    for custom_sentences_dir in settings.custom_sentences_dirs:
-        dir_for_language = custom_sentences_dir / model.language
-        if not dir_for_language.is_dir():
-            # Try language family
-            dir_for_language = custom_sentences_dir / model.language_family
+    for custom_sentences_path in custom_sentences_paths:
+        _LOGGER.debug("Loading custom sentences from %s", custom_sentences_path)
 
-            if not dir_for_language.is_dir():
-                continue
-
-        for custom_sentences_path in sorted(dir_for_language.glob("*.yaml")):
-            _LOGGER.debug("Loading custom sentences from %s", custom_sentences_path)
-
-            with open(
-                custom_sentences_path, "r", encoding="utf-8"
-            ) as custom_sentences_file:
-                merge_dict(sentences_dict, yaml.load(custom_sentences_file) or {})
+        with open(
+            custom_sentences_path, "r", encoding="utf-8"
+        ) as custom_sentences_file:
+            merge_dict(sentences_dict, load_yaml(custom_sentences_file) or {})
 
     # Clean up lists that were wildcards but now have values
     for list_info in lists_dict.values():
@@ -140,29 +184,83 @@ def _create_intents(model: Model, settings: Settings, things: Things) -> Intents
     lang_intents = Intents.from_dict(sentences_dict)
     tr_lists = lang_data.add_transformed_slot_lists(lang_intents.slot_lists)
 
-    # Write YAML with training sentences (includes HA lists, triggers, etc.)
-    training_sentences_path = settings.training_sentences_path(model.id)
-    with open(
-        training_sentences_path, "w", encoding="utf-8"
-    ) as training_sentences_file:
-        # Add transformed lists to debug YAML
-        for tr_list_name, tr_list in tr_lists.items():
-            lists_dict[tr_list_name] = {
-                "values": [
-                    {
-                        "in": value.value_out,
-                        "out": value.value_out,
-                        "context": value.context or {},
-                        "metadata": value.metadata or {},
-                    }
-                    for value in tr_list.values
-                ]
-            }
+    # Add transformed lists to debug YAML
+    for tr_list_name, tr_list in tr_lists.items():
+        lists_dict[tr_list_name] = {
+            "values": [
+                {
+                    "in": value.value_out,
+                    "out": value.value_out,
+                    "context": value.context or {},
+                    "metadata": value.metadata or {},
+                }
+                for value in tr_list.values
+            ]
+        }
+
+    with io.StringIO() as training_sentences_file:
         yaml_output.dump(quote_strings(sentences_dict), training_sentences_file)
+        training_sentences_yaml = training_sentences_file.getvalue()
+
+    return lang_intents, training_sentences_yaml
+
+
+def _get_intents_cache_key(
+    settings: Settings, things: Things, training_info: TrainingInfo
+) -> str:
+    """Get a hash of everything that goes into creating intents."""
+    hasher = hashlib.sha256()
+
+    # Intents are pickled, so they depend on the code that created them
+    for package in ("speech-to-phrase", "hassil"):
+        hasher.update(f"{package}=={version(package)}\n".encode("utf-8"))
+
+    hasher.update(training_info.sentences_hash.encode("utf-8"))
+    hasher.update(_hash_file(settings.shared_lists_path))
+
+    # Exactly what is used from Home Assistant
+    things_dict = {
+        "lists": things.to_lists_dict(),
+        "trigger_sentences": things.trigger_sentences,
+    }
+    hasher.update(
+        json.dumps(things_dict, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    )
+
+    return hasher.hexdigest()
 
-    _LOGGER.debug("Wrote debug YAML to %s", training_sentences_path)
 
-    return lang_intents
+def _load_cached_intents(
+    cache_path: Path, cache_key: str
+) -> Optional[Tuple[Intents, str]]:
+    """Load intents and debug YAML if they were cached with the same key."""
+    if not cache_path.is_file():
+        return None
+
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cached_key, cached_intents, cached_yaml = pickle.load(cache_file)
+    except Exception:
+        _LOGGER.debug("Unable to load cached intents from %s", cache_path)
+        return None
+
+    if (
+        (cached_key != cache_key)
+        or (not isinstance(cached_intents, Intents))
+        or (not isinstance(cached_yaml, str))
+    ):
+        return None
+
+    _LOGGER.debug("Loaded cached intents from %s", cache_path)
+    return cached_intents, cached_yaml
+
+
+def _save_cached_intents(
+    cache_path: Path, cache_key: str, intents: Intents, training_sentences_yaml: str
+) -> None:
+    """Cache intents and debug YAML with a key."""
+    with open(cache_path, "wb") as cache_file:
+        pickle.dump((cache_key, intents, training_sentences_yaml), cache_file)
 
 
 def _create_intents_fst(
@@ -187,31 +285,66 @@ def _create_intents_fst(
     return fst
 
 
-def _get_sentences_hash(
-    model: Model, settings: Settings, chunk_size: int = 8192
+def _get_custom_sentences_paths(model: Model, settings: Settings) -> List[Path]:
+    """Get paths to custom sentences YAML files, sorted within each directory."""
+    custom_sentences_paths: List[Path] = []
+    for custom_sentences_dir in settings.custom_sentences_dirs:
+        # Try language, then language family
+        for dir_for_language in (
+            custom_sentences_dir / model.language,
+            custom_sentences_dir / model.language_family,
+        ):
+            try:
+                with os.scandir(dir_for_language) as dir_entries:
+                    custom_sentences_paths.extend(
+                        sorted(
+                            Path(entry.path)
+                            for entry in dir_entries
+                            if entry.name.endswith(".yaml") and entry.is_file()
+                        )
+                    )
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+            break
+
+    return custom_sentences_paths
+
+
+async def _get_sentences_hash(
+    model: Model, settings: Settings, custom_sentences_paths: List[Path]
 ) -> str:
     """Get a hash of sentences YAML files (builtin and custom)."""
+    sentences_paths = [
+        settings.sentences / f"{model.sentences_language}.yaml",
+        *custom_sentences_paths,
+    ]
+
+    # Hash files in parallel, but combine digests in a stable order
+    loop = asyncio.get_running_loop()
+    file_digests = await asyncio.gather(
+        *(
+            loop.run_in_executor(None, _hash_file, sentences_path)
+            for sentences_path in sentences_paths
+        )
+    )
+
     hasher = hashlib.sha256()
+    for file_digest in file_digests:
+        hasher.update(file_digest)
 
-    # Builtin sentences
-    sentences_path = settings.sentences / f"{model.sentences_language}.yaml"
-    with open(sentences_path, "rb") as sentences_file:
-        chunk = sentences_file.read(chunk_size)
-        hasher.update(chunk)
+    return hasher.hexdigest()
 
-    # Custom sentences
-    for custom_sentences_dir in settings.custom_sentences_dirs:
-        dir_for_language = custom_sentences_dir / model.language
-        if not dir_for_language.is_dir():
-            # Try language family
-            dir_for_language = custom_sentences_dir / model.language_family
 
-            if not dir_for_language.is_dir():
-                continue
+def _hash_file(file_path: Path, chunk_size: int = 1024 * 1024) -> bytes:
+    """Get the SHA-256 digest of an entire file."""
+    with open(file_path, "rb") as hash_file:
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+
+            return hashlib.file_digest(hash_file, "sha256").digest()
 
-        for custom_sentences_path in sorted(dir_for_language.glob("*.yaml")):
-            with open(custom_sentences_path, "rb") as custom_sentences_file:
-                chunk = custom_sentences_file.read(chunk_size)
-                hasher.update(chunk)
+        hasher = hashlib.sha256()
+        for chunk in iter(lambda: hash_file.read(chunk_size), b""):
+            hasher.update(chunk)
 
-    return hasher.hexdigest()
+        return hasher.digest()
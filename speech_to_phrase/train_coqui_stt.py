@@ -6,7 +6,6 @@ See:
 """
 
 import logging
-import shlex
 import unicodedata
 from pathlib import Path
 from typing import Dict, List, Set, Union
@@ -112,7 +111,7 @@ async def train_coqui_stt(model: Model, settings: Settings, fst: Fst) -> None:
     words_txt = train_dir / "words.txt"
     with open(words_txt, "w", encoding="utf-8") as words_file:
         print(EPS, 0, file=words_file)
-        for i, word in enumerate(sorted(fst.words), start=1):
+        for i, word in enumerate(fst.sorted_words, start=1):
             if word == EPS:
                 continue
 
@@ -121,7 +120,7 @@ async def train_coqui_stt(model: Model, settings: Settings, fst: Fst) -> None:
     output_txt = train_dir / "output.txt"
     with open(output_txt, "w", encoding="utf-8") as output_file:
         print(EPS, 0, file=output_file)
-        for i, word in enumerate(sorted(fst.words), start=1):
+        for i, word in enumerate(fst.sorted_words, start=1):
             if word == EPS:
                 continue
 
@@ -201,23 +200,23 @@ async def train_coqui_stt(model: Model, settings: Settings, fst: Fst) -> None:
     await settings.tools.async_run_pipeline(
         [
             "fstcompile",
-            shlex.quote(f"--isymbols={tokens_with_blank}"),
-            shlex.quote(f"--osymbols={tokens_without_blank}"),
-            shlex.quote(str(token2char_txt)),
+            f"--isymbols={tokens_with_blank}",
+            f"--osymbols={tokens_without_blank}",
+            str(token2char_txt),
         ],
         ["fstdeterminize"],
         ["fstminimize"],
         ["fstpush", "--push_weights"],
-        ["fstarcsort", "--sort_type=ilabel", "-", shlex.quote(str(token2char_fst))],
+        ["fstarcsort", "--sort_type=ilabel", "-", str(token2char_fst)],
     )
 
     char2word_fst = train_dir / "char2word.fst"
     await _try_minimize(
         [
             "fstcompile",
-            shlex.quote(f"--isymbols={tokens_without_blank}"),
-            shlex.quote(f"--osymbols={words_txt}"),
-            shlex.quote(str(char2word_txt)),
+            f"--isymbols={tokens_without_blank}",
+            f"--osymbols={words_txt}",
+            str(char2word_txt),
         ],
         char2word_fst,
         settings.tools,
@@ -227,9 +226,9 @@ async def train_coqui_stt(model: Model, settings: Settings, fst: Fst) -> None:
     await _try_minimize(
         [
             "fstcompile",
-            shlex.quote(f"--isymbols={words_txt}"),
-            shlex.quote(f"--osymbols={output_txt}"),
-            shlex.quote(str(word2sen_txt)),
+            f"--isymbols={words_txt}",
+            f"--osymbols={output_txt}",
+            str(word2sen_txt),
         ],
         word2sen_fst,
         settings.tools,
@@ -240,8 +239,8 @@ async def train_coqui_stt(model: Model, settings: Settings, fst: Fst) -> None:
     await _try_minimize(
         [
             "fstcompose",
-            shlex.quote(str(token2char_fst)),
-            shlex.quote(str(char2word_fst)),
+            str(token2char_fst),
+            str(char2word_fst),
         ],
         token2word_fst,
         settings.tools,
@@ -252,12 +251,12 @@ async def train_coqui_stt(model: Model, settings: Settings, fst: Fst) -> None:
     await settings.tools.async_run_pipeline(
         [
             "fstcompose",
-            shlex.quote(str(token2word_fst)),
-            shlex.quote(str(word2sen_fst)),
+            str(token2word_fst),
+            str(word2sen_fst),
         ],
         ["fstrmepsilon"],
         ["fstpush", "--push_weights"],
-        ["fstarcsort", "--sort_type=ilabel", "-", shlex.quote(str(token2sen_fst))],
+        ["fstarcsort", "--sort_type=ilabel", "-", str(token2sen_fst)],
     )
 
 
@@ -278,7 +277,7 @@ async def _try_minimize(
                 "fstarcsort",
                 f"--sort_type={arc_sort_type}",
                 "-",
-                shlex.quote(str(fst_path)),
+                str(fst_path),
             ],
         )
     except Exception:
@@ -290,6 +289,6 @@ async def _try_minimize(
                 "fstarcsort",
                 f"--sort_type={arc_sort_type}",
                 "-",
-                shlex.quote(str(fst_path)),
+                str(fst_path),
             ],
         )
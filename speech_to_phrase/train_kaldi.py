@@ -1,13 +1,12 @@
 """Model training for Kaldi."""
 
-import gzip
-import hashlib
+import asyncio
+import io
 import logging
-import shlex
 import shutil
 import tempfile
 from pathlib import Path
-from typing import Set
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
 
 from .const import EPS, SIL, SPN, UNK, Settings
 from .g2p import LexiconDatabase
@@ -17,6 +16,9 @@ from .speech_tools import SpeechTools
 
 _LOGGER = logging.getLogger(__name__)
 
+_WRITE_BUFFER_SIZE = 1024 * 1024
+_META_WORD_PREFIXES = ("<", "_")  # <eps>, __output:, etc.
+
 
 async def train_kaldi(
     model: Model, settings: Settings, lexicon: LexiconDatabase, fst: Fst
@@ -26,12 +28,15 @@ async def train_kaldi(
     train_dir = settings.model_train_dir(model.id).absolute()
     train_dir.mkdir(parents=True, exist_ok=True)
 
-    # Copy conf
+    # Create conf link (read-only for Kaldi scripts)
     conf_dir = train_dir / "conf"
-    if conf_dir.exists():
+    if conf_dir.is_symlink():
+        conf_dir.unlink()
+    elif conf_dir.exists():
+        # Copied by older versions
         shutil.rmtree(conf_dir)
 
-    shutil.copytree(model_dir / "conf", conf_dir)
+    conf_dir.symlink_to(model_dir / "conf", target_is_directory=True)
 
     # Delete existing data/graph
     data_dir = train_dir / "data"
@@ -71,9 +76,24 @@ async def train_kaldi(
     # 1. prepare_lang.sh
     await _prepare_lang(train_dir, settings.tools)
 
-    # 2. Generate G.fst from skill graph
-    await _create_arpa(fst, train_dir, settings.tools)
-    await _create_fuzzy_fst(fst, train_dir, settings.tools)
+    # 2. Generate G.fst from skill graph.
+    # Both FSTs are created from the same text FST and write separate outputs.
+    fst_text = _get_fst_text(fst)
+    fst_tasks = [
+        asyncio.create_task(_create_arpa(fst_text, train_dir, settings.tools)),
+        asyncio.create_task(
+            _create_fuzzy_fst(fst_text, fst, train_dir, settings.tools)
+        ),
+    ]
+    try:
+        await asyncio.gather(*fst_tasks)
+    except BaseException:
+        # Stop the other task so nothing is written after the error
+        for fst_task in fst_tasks:
+            fst_task.cancel()
+
+        await asyncio.gather(*fst_tasks, return_exceptions=True)
+        raise
 
     # 3. mkgraph.sh
     await _mkgraph(model_dir, train_dir, settings.tools)
@@ -104,75 +124,44 @@ async def _create_lexicon(
     for phone_file in phones_dir.glob("*.txt"):
         shutil.copy(phone_file, dict_local_dir / phone_file.name)
 
-    # Create dictionary
+    # Look up known pronunciations (off the event loop)
+    loop = asyncio.get_running_loop()
+    words = [word for word in fst.sorted_words if word not in (UNK,)]
+    word_prons = await loop.run_in_executor(None, lexicon.lookup_many, words)
+    known_lines = [
+        f"{word} {' '.join(word_pron)}\n"
+        for word, prons in word_prons.items()
+        for word_pron in prons
+    ]
+    missing_words = sorted(set(words) - word_prons.keys())
+
+    missing_words_path = train_dir / "missing_words_dictionary.txt"
+    missing_words_path.unlink(missing_ok=True)
+
+    # Write known pronunciations while guessing missing ones
     dictionary_path = dict_local_dir / "lexicon.txt"
-    with open(dictionary_path, "w", encoding="utf-8") as dictionary_file:
-        missing_words = set()
-        for word in sorted(fst.words):
-            if word in (UNK,):
-                continue
-
-            word_found = False
-            for word_pron in lexicon.lookup(word):
-                phonemes_str = " ".join(word_pron)
-                print(word, phonemes_str, file=dictionary_file)
-                word_found = True
-
-            if not word_found:
-                missing_words.add(word)
-
-        missing_words_path = train_dir / "missing_words_dictionary.txt"
-        missing_words_path.unlink(missing_ok=True)
-
-        if missing_words:
-            g2p_model_path = model_dir.parent / "g2p.fst"
-            with tempfile.NamedTemporaryFile(
-                mode="w+", suffix=".txt", encoding="utf-8"
-            ) as missing_words_file, open(
-                missing_words_path, "w", encoding="utf-8"
-            ) as missing_dictionary_file:
-                for word in sorted(missing_words):
-                    _LOGGER.warning("Guessing pronunciation for %s", word)
-                    print(word, file=missing_words_file)
-
-                missing_words_file.seek(0)
-                phonetisaurus_output = (
-                    (
-                        await tools.async_run(
-                            str(tools.phonetisaurus_bin),
-                            [
-                                f"--model={g2p_model_path}",
-                                f"--wordlist={missing_words_file.name}",
-                            ],
-                        )
-                    )
-                    .decode()
-                    .splitlines()
-                )
-                for line in phonetisaurus_output:
-                    line = line.strip()
-                    if line:
-                        line_parts = line.split()
-                        if len(line_parts) == 2:
-                            word = line_parts[0]
-                            _LOGGER.warning(
-                                "No pronunciation could be guessed for: '%s'", word
-                            )
-                            print(word, SIL, file=dictionary_file)
-                            continue
-
-                        if len(line_parts) < 3:
-                            continue
-
-                        word = line_parts[0]
-                        phonemes = " ".join(line_parts[2:])
-
-                        print(
-                            word,
-                            phonemes,
-                            file=missing_dictionary_file,
-                        )
-                        print(word, phonemes, file=dictionary_file)
+    _, guessed_prons = await asyncio.gather(
+        loop.run_in_executor(None, _write_lines, dictionary_path, known_lines),
+        _guess_pronunciations(missing_words, model_dir.parent / "g2p.fst", tools),
+    )
+
+    if missing_words:
+        _write_lines(
+            missing_words_path,
+            [
+                f"{word} {phonemes}\n"
+                for word, phonemes in guessed_prons
+                if phonemes is not None
+            ],
+        )
+
+    with open(dictionary_path, "a", encoding="utf-8") as dictionary_file:
+        for word, phonemes in guessed_prons:
+            if phonemes is None:
+                _LOGGER.warning("No pronunciation could be guessed for: '%s'", word)
+                phonemes = SIL
+
+            print(word, phonemes, file=dictionary_file)
 
         # Add <unk>
         print(UNK, spn_phone, file=dictionary_file)
@@ -182,6 +171,55 @@ async def _create_lexicon(
             print(label, SIL, file=dictionary_file)
 
 
+async def _guess_pronunciations(
+    words: List[str], g2p_model_path: Path, tools: SpeechTools
+) -> List[Tuple[str, Optional[str]]]:
+    """Guess pronunciations with phonetisaurus (None if no guess was made)."""
+    if not words:
+        return []
+
+    with tempfile.NamedTemporaryFile(
+        mode="w+", suffix=".txt", encoding="utf-8"
+    ) as words_file:
+        for word in words:
+            _LOGGER.warning("Guessing pronunciation for %s", word)
+            print(word, file=words_file)
+
+        words_file.flush()
+        phonetisaurus_output = (
+            (
+                await tools.async_run(
+                    str(tools.phonetisaurus_bin),
+                    [
+                        f"--model={g2p_model_path}",
+                        f"--wordlist={words_file.name}",
+                    ],
+                )
+            )
+            .decode()
+            .splitlines()
+        )
+
+    guessed_prons: List[Tuple[str, Optional[str]]] = []
+    for line in phonetisaurus_output:
+        line_parts = line.split()
+        if len(line_parts) == 2:
+            # No guess
+            guessed_prons.append((line_parts[0], None))
+        elif len(line_parts) >= 3:
+            guessed_prons.append((line_parts[0], " ".join(line_parts[2:])))
+
+    return guessed_prons
+
+
+def _write_lines(file_path: Path, lines: List[str]) -> None:
+    """Write text lines to a file."""
+    with open(
+        file_path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+    ) as lines_file:
+        lines_file.writelines(lines)
+
+
 async def _prepare_lang(train_dir: Path, tools: SpeechTools) -> None:
     """Prepare data directory for language model."""
     data_dir = train_dir / "data"
@@ -203,8 +241,15 @@ async def _prepare_lang(train_dir: Path, tools: SpeechTools) -> None:
     )
 
 
+def _get_fst_text(fst: Fst) -> str:
+    """Get intents FST in text format."""
+    with io.StringIO() as fst_file:
+        fst.write(fst_file)
+        return fst_file.getvalue()
+
+
 async def _create_arpa(
-    fst: Fst,
+    fst_text: str,
     train_dir: Path,
     tools: SpeechTools,
     order: int = 3,
@@ -218,28 +263,26 @@ async def _create_arpa(
     lang_local_dir = data_local_dir / "lang"
 
     fst_path = lang_dir / "G.arpa.fst"
-    text_fst_path = fst_path.with_suffix(".fst.txt")
     arpa_path = lang_dir / "lm.arpa"
 
-    with open(text_fst_path, "w", encoding="utf-8") as text_fst_file:
-        fst.write(text_fst_file)
-
+    # Text FST is piped to stdin
     await tools.async_run(
         "fstcompile",
         [
-            shlex.quote(f"--isymbols={lang_dir}/words.txt"),
-            shlex.quote(f"--osymbols={lang_dir}/words.txt"),
+            f"--isymbols={lang_dir}/words.txt",
+            f"--osymbols={lang_dir}/words.txt",
             "--keep_isymbols=true",
             "--keep_osymbols=true",
-            shlex.quote(str(text_fst_path)),
-            shlex.quote(str(fst_path)),
+            "-",
+            str(fst_path),
         ],
+        input=fst_text.encode("utf-8"),
     )
     await tools.async_run_pipeline(
         [
             "ngramcount",
             f"--order={order}",
-            shlex.quote(str(fst_path)),
+            str(fst_path),
             "-",
         ],
         [
@@ -250,15 +293,22 @@ async def _create_arpa(
             "ngramprint",
             "--ARPA",
             "-",
-            shlex.quote(str(arpa_path)),
+            str(arpa_path),
         ],
     )
 
+    # Compress in a subprocess so the event loop isn't blocked.
+    # pigz is used if available since it compresses in parallel.
     arpa_gz_path = lang_local_dir / "lm.arpa.gz"
-    with open(arpa_path, "r", encoding="utf-8") as arpa_file, gzip.open(
-        arpa_gz_path, "wt", encoding="utf-8"
-    ) as arpa_gz_file:
-        shutil.copyfileobj(arpa_file, arpa_gz_file)  # type: ignore[misc]
+    gzip_program = "gzip"
+    if shutil.which("pigz", path=tools.extended_env.get("PATH")):
+        gzip_program = "pigz"
+
+    with open(arpa_gz_path, "wb") as arpa_gz_file:
+        # Compressed output goes straight to the file
+        await tools.async_run(
+            gzip_program, ["-n", "-c", str(arpa_path)], stdout=arpa_gz_file
+        )
 
     await tools.async_run(
         "bash",
@@ -272,71 +322,73 @@ async def _create_arpa(
     )
 
 
-async def _create_fuzzy_fst(fst: Fst, train_dir: Path, tools: SpeechTools) -> None:
+async def _create_fuzzy_fst(
+    fst_text: str, fst: Fst, train_dir: Path, tools: SpeechTools
+) -> None:
     """Create FST to fuzzy match sentences and output names with exact casing, etc."""
     data_dir = train_dir / "data"
     lang_dir = data_dir / "lang"
 
-    fst_path = lang_dir / "G.arpa.fst"
-    text_fst_path = fst_path.with_suffix(".fst.txt")
-
     # Create a version of the FST with self loops that allow skipping words
     fuzzy_fst_path = lang_dir / "G.fuzzy.fst"
-    text_fuzzy_fst_path = fuzzy_fst_path.with_suffix(".fst.txt")
     _LOGGER.debug("Creating fuzzy FST at %s", fuzzy_fst_path)
 
-    states: Set[str] = set()
-
-    # Copy transitions and add self loops
-    with open(text_fst_path, "r", encoding="utf-8") as text_fst_file, open(
-        text_fuzzy_fst_path, "w", encoding="utf-8"
-    ) as text_fuzzy_fst_file:
-        for line in text_fst_file:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Copy transition
-            print(line, file=text_fuzzy_fst_file)
-
-            state = line.split(maxsplit=1)[0]
-            if state in states:
-                continue
-
-            states.add(state)
-
-        # Create self loops
-        for state in states:
-            # No penalty for <eps>
-            print(state, state, EPS, EPS, 0.0, file=text_fuzzy_fst_file)
-
-            for word in fst.words:
-                if word[0] in ("<", "_"):
-                    # Skip meta words
-                    continue
-
-                # Penalty for word removal
-                print(state, state, word, EPS, 1.0, file=text_fuzzy_fst_file)
-
+    # Text is streamed into fstcompile as it's generated
     await tools.async_run_pipeline(
         [
             "fstcompile",
-            shlex.quote(f"--isymbols={lang_dir}/words.txt"),
-            shlex.quote(f"--osymbols={lang_dir}/words.txt"),
+            f"--isymbols={lang_dir}/words.txt",
+            f"--osymbols={lang_dir}/words.txt",
             "--keep_isymbols=true",
             "--keep_osymbols=true",
-            shlex.quote(str(text_fuzzy_fst_path)),
+            "-",
             "-",
         ],
         [
             "fstarcsort",
             "--sort_type=ilabel",
             "-",
-            shlex.quote(str(fuzzy_fst_path)),
+            str(fuzzy_fst_path),
         ],
+        input_text=_get_fuzzy_fst_lines(fst_text, fst.sorted_words),
     )
 
 
+def _get_fuzzy_fst_lines(fst_text: str, words: Iterable[str]) -> Iterator[str]:
+    """Yield transitions of the FST followed by self loops for each state."""
+    # Penalty for word removal (skip meta words).
+    # Formatted once and prefixed with each state below.
+    skip_word_lines = [
+        f"{word} {EPS} 1.0\n"
+        for word in words
+        if not word.startswith(_META_WORD_PREFIXES)
+    ]
+
+    states: Set[str] = set()
+
+    # Copy transitions
+    for line in fst_text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        yield f"{line}\n"
+
+        state = line.split(maxsplit=1)[0]
+        if state in states:
+            continue
+
+        states.add(state)
+
+    # Create self loops
+    for state in states:
+        state_prefix = f"{state} {state} "
+
+        # No penalty for <eps>
+        yield f"{state_prefix}{EPS} {EPS} 0.0\n"
+        yield "".join([state_prefix + line for line in skip_word_lines])
+
+
 async def _mkgraph(model_dir: Path, train_dir: Path, tools: SpeechTools) -> None:
     """Generate HCLG.fst."""
     data_dir = train_dir / "data"
@@ -385,36 +437,3 @@ async def _prepare_online_decoding(
         ],
         cwd=train_dir,
     )
-
-
-# -----------------------------------------------------------------------------
-
-
-def _get_sentences_hash(
-    model: Model, settings: Settings, chunk_size: int = 8192
-) -> str:
-    """Get a hash of sentences YAML files (builtin and custom)."""
-    hasher = hashlib.sha256()
-
-    # Builtin sentences
-    sentences_path = settings.sentences / f"{model.sentences_language}.yaml"
-    with open(sentences_path, "rb") as sentences_file:
-        chunk = sentences_file.read(chunk_size)
-        hasher.update(chunk)
-
-    # Custom sentences
-    for custom_sentences_dir in settings.custom_sentences_dirs:
-        dir_for_language = custom_sentences_dir / model.language
-        if not dir_for_language.is_dir():
-            # Try language family
-            dir_for_language = custom_sentences_dir / model.language_family
-
-            if not dir_for_language.is_dir():
-                continue
-
-        for custom_sentences_path in sorted(dir_for_language.glob("*.yaml")):
-            with open(custom_sentences_path, "rb") as custom_sentences_file:
-                chunk = custom_sentences_file.read(chunk_size)
-                hasher.update(chunk)
-
-    return hasher.hexdigest()
@@ -10,7 +10,6 @@ import asyncio.subprocess
 import itertools
 import logging
 import math
-import shlex
 import struct
 import tempfile
 from collections.abc import AsyncIterable
@@ -148,25 +147,25 @@ async def _decode_probs(
         stdout = await tools.async_run_pipeline(
             [
                 "fstcompile",
-                shlex.quote(f"--isymbols={tokens_txt}"),
-                shlex.quote(f"--osymbols={tokens_txt}"),
+                f"--isymbols={tokens_txt}",
+                f"--osymbols={tokens_txt}",
                 "--acceptor",
-                shlex.quote(str(logits_txt)),
+                str(logits_txt),
             ],
             ["fstdeterminize"],
             ["fstminimize"],
             ["fstpush", "--push_weights"],
             ["fstarcsort", "--sort_type=olabel"],
             ["fstprune", f"--weight={prune_threshold}"],  # prune logits
-            ["fstcompose", "-", shlex.quote(str(token2sen_fst))],
+            ["fstcompose", "-", str(token2sen_fst)],
             ["fstshortestpath"],
             ["fstproject", "--project_type=output"],
             ["fstrmepsilon"],
             ["fsttopsort"],
             [
                 "fstprint",
-                shlex.quote(f"--isymbols={output_txt}"),
-                shlex.quote(f"--osymbols={output_txt}"),
+                f"--isymbols={output_txt}",
+                f"--osymbols={output_txt}",
             ],
             # ["awk", "{print $4}"],  # output label
         )
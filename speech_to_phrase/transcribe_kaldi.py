@@ -3,7 +3,6 @@
 import asyncio
 import io
 import logging
-import shlex
 import tempfile
 from collections.abc import AsyncIterable
 from pathlib import Path
@@ -169,7 +168,7 @@ async def _get_fuzzy_text(
             [
                 "fstcompose",
                 "-",
-                shlex.quote(str(fuzzy_fst_path)),
+                str(fuzzy_fst_path),
             ],
             ["fstshortestpath"],
             ["fstrmepsilon"],
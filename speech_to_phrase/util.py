@@ -1,19 +1,136 @@
 """Utility methods."""
 
 import re
-from typing import Any
+from typing import IO, Any, Union
 
+import yaml as pyyaml
 from ruamel.yaml import YAML
 from ruamel.yaml.scalarstring import DoubleQuotedScalarString
 
+try:
+    # Use libyaml if available
+    from yaml import CSafeLoader as PyYamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as PyYamlSafeLoader
+
 yaml = YAML(typ="safe")
 
+_YAML_BOOL_TAG = "tag:yaml.org,2002:bool"
+_YAML_INT_TAG = "tag:yaml.org,2002:int"
+_YAML_FLOAT_TAG = "tag:yaml.org,2002:float"
+_YAML_MERGE_TAG = "tag:yaml.org,2002:merge"
+
+
+class _Yaml12SafeLoader(PyYamlSafeLoader):  # pylint: disable=too-many-ancestors
+    """PyYAML safe loader that resolves scalars like YAML 1.2 (same as ruamel).
+
+    YAML 1.1 would load on/off/yes/no as booleans and 10:30 as an integer.
+    Duplicate keys are an error instead of silently keeping the last value.
+    """
+
+    def construct_mapping(self, node: pyyaml.MappingNode, deep: bool = False):
+        keys = set()
+        for key_node, _value_node in node.value:
+            if key_node.tag == _YAML_MERGE_TAG:
+                # Merged keys may be overridden
+                continue
+
+            key = self.construct_object(key_node, deep=deep)
+            try:
+                is_duplicate = key in keys
+            except TypeError:
+                # Unhashable key is reported below
+                continue
+
+            if is_duplicate:
+                raise pyyaml.constructor.ConstructorError(
+                    "while constructing a mapping",
+                    node.start_mark,
+                    f"found duplicate key {key!r}",
+                    key_node.start_mark,
+                )
+
+            keys.add(key)
+
+        return super().construct_mapping(node, deep=deep)
+
+
+_Yaml12SafeLoader.yaml_implicit_resolvers = {
+    first_char: [
+        (tag, regexp)
+        for tag, regexp in resolvers
+        if tag not in (_YAML_BOOL_TAG, _YAML_INT_TAG, _YAML_FLOAT_TAG)
+    ]
+    for first_char, resolvers in PyYamlSafeLoader.yaml_implicit_resolvers.items()
+}
+_Yaml12SafeLoader.add_implicit_resolver(
+    _YAML_BOOL_TAG,
+    re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"),
+    list("tTfF"),
+)
+_Yaml12SafeLoader.add_implicit_resolver(
+    _YAML_INT_TAG,
+    re.compile(
+        r"""^(?:[-+]?0b[0-1_]+
+        |[-+]?0o?[0-7_]+
+        |[-+]?[0-9_]+
+        |[-+]?0x[0-9a-fA-F_]+)$""",
+        re.X,
+    ),
+    list("-+0123456789"),
+)
+_Yaml12SafeLoader.add_implicit_resolver(
+    _YAML_FLOAT_TAG,
+    re.compile(
+        r"""^(?:[-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?
+        |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
+        |[-+]?\.[0-9_]+(?:[eE][-+][0-9]+)?
+        |[-+]?\.(?:inf|Inf|INF)
+        |\.(?:nan|NaN|NAN))$""",
+        re.X,
+    ),
+    list("-+0123456789."),
+)
+
+
+def _construct_yaml12_int(loader: pyyaml.SafeLoader, node: pyyaml.ScalarNode) -> int:
+    """Construct an integer without YAML 1.1 octal (017) or base 60 (10:30)."""
+    value = str(loader.construct_scalar(node)).replace("_", "")
+    sign = 1
+    if value[0] in "+-":
+        if value[0] == "-":
+            sign = -1
+
+        value = value[1:]
+
+    if value.startswith("0b"):
+        return sign * int(value[2:], 2)
+
+    if value.startswith("0o"):
+        return sign * int(value[2:], 8)
+
+    if value.startswith("0x"):
+        return sign * int(value[2:], 16)
+
+    return sign * int(value)
+
+
+_Yaml12SafeLoader.add_constructor(_YAML_INT_TAG, _construct_yaml12_int)
+
 yaml_output = YAML()
 yaml_output.explicit_start = True
 yaml_output.default_flow_style = False
 yaml_output.indent(sequence=4, offset=2)
 
 
+def load_yaml(stream: Union[str, IO[str]]) -> Any:
+    """Load YAML quickly with PyYAML's C loader (falls back to pure Python).
+
+    Scalars are resolved like YAML 1.2, so results match ruamel.
+    """
+    return pyyaml.load(stream, Loader=_Yaml12SafeLoader)
+
+
 def get_language_family(language: str) -> str:
     """Get language family (en_US -> en)."""
     return re.split("[-_]", language, maxsplit=1)[0]
@@ -1,5 +1,9 @@
 """Tests for grapheme-to-phoneme (g2p) methods."""
 
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 from unicode_rbnf import RbnfEngine
 
 from speech_to_phrase.g2p import LexiconDatabase, split_words
@@ -34,3 +38,47 @@ def test_decimal_numbers() -> None:
         ("virgule", None),
         ("cinq", None),
     ]
+
+
+def test_lookup_many(tmp_path: Path) -> None:
+    db_path = tmp_path / "lexicon.db"
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute(
+            "CREATE TABLE word_phonemes (word TEXT, phonemes TEXT, pron_order INTEGER)"
+        )
+        conn.executemany(
+            "INSERT INTO word_phonemes VALUES (?, ?, ?)",
+            [
+                ("hello", "h ə l oʊ", 0),
+                ("hello", "h ɛ l oʊ", 1),
+                ("world", "w ɝ l d", 0),
+            ],
+        )
+
+    lexicon = LexiconDatabase(db_path)
+    prons = lexicon.lookup_many(["Hello", "world", "missing"], batch_size=1)
+    assert prons == {
+        "Hello": [["h", "ə", "l", "oʊ"], ["h", "ɛ", "l", "oʊ"]],
+        "world": [["w", "ɝ", "l", "d"]],
+    }
+
+    # Same results as individual lookups
+    for word in ("Hello", "world", "missing"):
+        assert LexiconDatabase(db_path).lookup(word) == prons.get(word, [])
+
+
+def test_lookup_threads(tmp_path: Path) -> None:
+    db_path = tmp_path / "lexicon.db"
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute(
+            "CREATE TABLE word_phonemes (word TEXT, phonemes TEXT, pron_order INTEGER)"
+        )
+        conn.execute("INSERT INTO word_phonemes VALUES ('hello', 'h ə l oʊ', 0)")
+
+    # Connections are per-thread, so lookups can happen from any thread
+    lexicon = LexiconDatabase(db_path)
+    assert lexicon.lookup("hello") == [["h", "ə", "l", "oʊ"]]
+    with ThreadPoolExecutor(2) as executor:
+        assert executor.submit(lexicon.lookup_many, ["Hello"]).result() == {
+            "Hello": [["h", "ə", "l", "oʊ"]]
+        }
@@ -5,7 +5,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from speech_to_phrase.hass_api import Entity, Things, get_hass_info
+from speech_to_phrase.hass_api import Area, Entity, Floor, Things, get_hass_info
 
 
 class MockWebsocket:
@@ -98,6 +98,18 @@ def test_template_syntax_removed() -> None:
     }
 
 
+def test_things_hash_areas_floors() -> None:
+    """Test that area and floor names change the hash."""
+    assert (
+        Things(areas=[Area(names=["Kitchen"])]).get_hash()
+        != Things(areas=[Area(names=["Den"])]).get_hash()
+    )
+    assert (
+        Things(floors=[Floor(names=["Upstairs"])]).get_hash()
+        != Things(floors=[Floor(names=["Downstairs"])]).get_hash()
+    )
+
+
 @pytest.mark.asyncio
 async def test_system_and_pipeline_languages() -> None:
     """Test retrieval of HA system language and pipeline STT languages."""
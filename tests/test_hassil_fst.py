@@ -1,6 +1,5 @@
 import io
 import re
-import shlex
 import tempfile
 from pathlib import Path
 
@@ -9,7 +8,7 @@ from hassil import Intents
 
 from speech_to_phrase.const import WordCasing
 from speech_to_phrase.g2p import LexiconDatabase
-from speech_to_phrase.hassil_fst import SPACE, G2PInfo, intents_to_fst
+from speech_to_phrase.hassil_fst import SPACE, Fst, G2PInfo, intents_to_fst
 
 from . import SETTINGS
 
@@ -373,17 +372,17 @@ lists:
         await tools.async_run(
             "fstcompile",
             [
-                shlex.quote(f"--isymbols={words_path}"),
-                shlex.quote(f"--osymbols={words_path}"),
+                f"--isymbols={words_path}",
+                f"--osymbols={words_path}",
                 "--keep_isymbols=true",
                 "--keep_osymbols=true",
-                shlex.quote(str(text_fst_path)),
-                shlex.quote(str(fst_path)),
+                str(text_fst_path),
+                str(fst_path),
             ],
         )
         await tools.async_run_pipeline(
-            ["ngramcount", "--order=3", shlex.quote(str(fst_path)), "-"],
-            ["ngrammake", "--method=katz", "-", shlex.quote(str(ngram_fst_path))],
+            ["ngramcount", "--order=3", str(fst_path), "-"],
+            ["ngrammake", "--method=katz", "-", str(ngram_fst_path)],
         )
 
         test_sentences = [
@@ -403,9 +402,9 @@ lists:
                 "farcompilestrings",
                 [
                     "--entry_type=file",
-                    shlex.quote(f"--symbols={words_path}"),
-                    shlex.quote(str(test_sentences_path)),
-                    shlex.quote(str(test_archive_path)),
+                    f"--symbols={words_path}",
+                    str(test_sentences_path),
+                    str(test_archive_path),
                 ],
             )
 
@@ -413,8 +412,8 @@ lists:
                 await tools.async_run(
                     "ngramperplexity",
                     [
-                        shlex.quote(str(ngram_fst_path)),
-                        shlex.quote(str(test_archive_path)),
+                        str(ngram_fst_path),
+                        str(test_archive_path),
                     ],
                 )
             ).decode("utf-8")
@@ -442,3 +441,18 @@ lists:
         # they will still not be identical because order=3.
         perplexity_ratio = time_perplexity / color_perplexity
         assert perplexity_ratio < 1.5, perplexity_ratio
+
+
+def test_sorted_words() -> None:
+    fst = Fst()
+    state = fst.next_edge(fst.start, "b")
+    state = fst.next_edge(state, "a")
+    assert fst.sorted_words == ("a", "b")
+
+    # Cache is reset when a new word is added
+    fst.next_edge(state, "c")
+    assert fst.sorted_words == ("a", "b", "c")
+
+    # Cache can't be passed in
+    with pytest.raises(TypeError):
+        Fst(_sorted_words=("stale",))  # type: ignore[call-arg]
@@ -0,0 +1,138 @@
+"""Tests for running local speech tools."""
+
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from speech_to_phrase.speech_tools import SpeechTools
+
+
+def _make_tools(tmp_path: Path) -> SpeechTools:
+    return SpeechTools.from_tools_dir(tmp_path / "tools")
+
+
+@pytest.mark.asyncio
+async def test_run_cancelled(tmp_path: Path) -> None:
+    """Test that a cancelled command is killed."""
+    tools = _make_tools(tmp_path)
+    marker_path = tmp_path / "marker"
+    task = asyncio.create_task(
+        tools.async_run("sh", ["-c", f"sleep 0.5 && touch '{marker_path}'"])
+    )
+    await asyncio.sleep(0.1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    await asyncio.sleep(1)
+    assert not marker_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_cancelled(tmp_path: Path) -> None:
+    """Test that all commands of a cancelled pipeline are killed."""
+    tools = _make_tools(tmp_path)
+    marker_path = tmp_path / "marker"
+    task = asyncio.create_task(
+        tools.async_run_pipeline(
+            ["sh", "-c", "sleep 0.5 && echo done"],
+            ["sh", "-c", f"cat && touch '{marker_path}'"],
+        )
+    )
+    await asyncio.sleep(0.1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    await asyncio.sleep(1)
+    assert not marker_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_run_stdout_file(tmp_path: Path) -> None:
+    """Test that output can go directly to a file."""
+    tools = _make_tools(tmp_path)
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("test output\n", encoding="utf-8")
+
+    output_path = tmp_path / "output.txt"
+    with open(output_path, "wb") as output_file:
+        assert not await tools.async_run("cat", [str(input_path)], stdout=output_file)
+
+    assert output_path.read_text(encoding="utf-8") == "test output\n"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_input_output(tmp_path: Path) -> None:
+    """Test that input goes to the first command and output is from the last."""
+    tools = _make_tools(tmp_path)
+    assert (
+        await tools.async_run_pipeline(
+            ["cat"], ["tr", "a-z", "A-Z"], ["tr", "L", "_"], input=b"hello world"
+        )
+        == b"HE__O WOR_D"
+    )
+
+
+@pytest.mark.asyncio
+async def test_pipeline_failed_command(tmp_path: Path) -> None:
+    """Test that a failing command that isn't last raises an error."""
+    tools = _make_tools(tmp_path)
+    with pytest.raises(RuntimeError, match="exit 3") as exc_info:
+        await tools.async_run_pipeline(["sh", "-c", "echo partial; exit 3"], ["cat"])
+
+    # Output of the last command isn't reported for the failing command
+    assert str(exc_info.value).endswith(": exit code 3")
+
+    with pytest.raises(RuntimeError, match="failure message"):
+        await tools.async_run_pipeline(
+            ["sh", "-c", "echo failure message >&2; exit 1"], ["cat"]
+        )
+
+
+@pytest.mark.asyncio
+async def test_pipeline_missing_program(tmp_path: Path) -> None:
+    """Test that a missing program raises an error without leaking pipes."""
+    tools = _make_tools(tmp_path)
+    fds_before = set(os.listdir("/proc/self/fd"))
+
+    for commands in (
+        (["missing-program-for-test"], ["cat"]),
+        (["cat"], ["missing-program-for-test"], ["cat"]),
+        (["cat"], ["missing-program-for-test"]),
+    ):
+        with pytest.raises(FileNotFoundError):
+            await tools.async_run_pipeline(*commands, input=b"test")
+
+        with pytest.raises(FileNotFoundError):
+            await tools.async_run_pipeline(*commands, input_text=["test\n"])
+
+    assert set(os.listdir("/proc/self/fd")) == fds_before
+
+
+@pytest.mark.asyncio
+async def test_pipeline_input_text(tmp_path: Path) -> None:
+    """Test that large input text is streamed to the first command."""
+    tools = _make_tools(tmp_path)
+    num_lines = 1_000_000
+    assert (
+        int(
+            await tools.async_run_pipeline(
+                ["cat"],
+                ["wc", "-l"],
+                input_text=(f"line {i}\n" for i in range(num_lines)),
+            )
+        )
+        == num_lines
+    )
+
+    # Command exits before all the input is written
+    assert (
+        await tools.async_run_pipeline(
+            ["head", "-n", "1"],
+            input_text=(f"line {i}\n" for i in range(num_lines)),
+        )
+        == b"line 0\n"
+    )
@@ -0,0 +1,263 @@
+"""Tests for training utilities."""
+
+import importlib
+from pathlib import Path
+
+import pytest
+import yaml
+from hassil import Intents, TextChunk, TextSlotList
+
+from speech_to_phrase import Language, Settings
+from speech_to_phrase.hass_api import Area, Things
+from speech_to_phrase.models import MODELS
+from speech_to_phrase.train import (
+    TrainingInfo,
+    _create_intents,
+    _get_custom_sentences_paths,
+    _get_intents_cache_key,
+    _get_sentences_hash,
+    _load_cached_intents,
+    _save_cached_intents,
+)
+
+_SENTENCES_DIR = Path(__file__).parent.parent / "speech_to_phrase" / "sentences"
+
+
+def _make_settings(tmp_path: Path) -> Settings:
+    return Settings(
+        models_dir=tmp_path / "models",
+        train_dir=tmp_path / "train",
+        tools_dir=tmp_path / "tools",
+        hass_token="",
+        hass_websocket_uri="",
+        retrain_on_connect=False,
+        custom_sentences_dirs=[tmp_path / "custom_sentences"],
+        sentences_dir=tmp_path / "sentences",
+    )
+
+
+@pytest.mark.asyncio
+async def test_sentences_hash_full_file(tmp_path: Path) -> None:
+    """Test that changes past the start of a sentences file change the hash."""
+    model = MODELS[Language.ENGLISH.value]
+    settings = _make_settings(tmp_path)
+    settings.sentences.mkdir(parents=True)
+
+    sentences_path = settings.sentences / f"{model.sentences_language}.yaml"
+    sentences_path.write_text("# " + ("x" * 20000) + "\n", encoding="utf-8")
+    hash_before = await _get_sentences_hash(
+        model, settings, _get_custom_sentences_paths(model, settings)
+    )
+
+    with open(sentences_path, "a", encoding="utf-8") as sentences_file:
+        print("# changed", file=sentences_file)
+
+    assert (
+        await _get_sentences_hash(
+            model, settings, _get_custom_sentences_paths(model, settings)
+        )
+        != hash_before
+    )
+
+
+@pytest.mark.asyncio
+async def test_sentences_hash_custom_sentences(tmp_path: Path) -> None:
+    """Test that custom sentences are included in the hash."""
+    model = MODELS[Language.ENGLISH.value]
+    settings = _make_settings(tmp_path)
+    settings.sentences.mkdir(parents=True)
+
+    sentences_path = settings.sentences / f"{model.sentences_language}.yaml"
+    sentences_path.write_text("language: en\n", encoding="utf-8")
+    hash_before = await _get_sentences_hash(
+        model, settings, _get_custom_sentences_paths(model, settings)
+    )
+
+    custom_dir = settings.custom_sentences_dirs[0] / model.language_family
+    custom_dir.mkdir(parents=True)
+    (custom_dir / "custom.yaml").write_text("language: en\n", encoding="utf-8")
+
+    assert (
+        await _get_sentences_hash(
+            model, settings, _get_custom_sentences_paths(model, settings)
+        )
+        != hash_before
+    )
+
+
+def test_custom_sentences_yaml_12(tmp_path: Path) -> None:
+    """Test that unquoted on/off/yes in custom sentences stay strings."""
+    model = MODELS[Language.ENGLISH.value]
+    settings = _make_settings(tmp_path)
+    settings.sentences = _SENTENCES_DIR
+    settings.model_train_dir(model.id).mkdir(parents=True)
+
+    custom_dir = settings.custom_sentences_dirs[0] / model.language
+    custom_dir.mkdir(parents=True)
+    (custom_dir / "custom.yaml").write_text(
+        "\n".join(
+            (
+                "language: en",
+                "intents:",
+                "  CustomIntent:",
+                "    data:",
+                '      - sentences: ["turn {custom_state}"]',
+                "lists:",
+                "  custom_state:",
+                "    values: [on, off, {in: yes, out: 1}, 10:30]",
+            )
+        ),
+        encoding="utf-8",
+    )
+
+    intents, _training_sentences_yaml = _create_intents(
+        model, settings, Things(), _get_custom_sentences_paths(model, settings)
+    )
+    custom_list = intents.slot_lists["custom_state"]
+    assert isinstance(custom_list, TextSlotList)
+    assert [value.text_in for value in custom_list.values] == [
+        TextChunk("on"),
+        TextChunk("off"),
+        TextChunk("yes"),
+        TextChunk("10:30"),
+    ]
+    assert [value.value_out for value in custom_list.values] == [
+        "on",
+        "off",
+        1,
+        "10:30",
+    ]
+
+
+def test_custom_sentences_duplicate_keys(tmp_path: Path) -> None:
+    """Test that duplicate keys in custom sentences are an error."""
+    model = MODELS[Language.ENGLISH.value]
+    settings = _make_settings(tmp_path)
+    settings.sentences = _SENTENCES_DIR
+    settings.model_train_dir(model.id).mkdir(parents=True)
+
+    custom_dir = settings.custom_sentences_dirs[0] / model.language
+    custom_dir.mkdir(parents=True)
+    (custom_dir / "custom.yaml").write_text(
+        "\n".join(
+            (
+                "language: en",
+                "lists:",
+                "  custom_state:",
+                "    values: [on, off]",
+                "lists:",
+                "  other_state:",
+                "    values: [up, down]",
+            )
+        ),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(yaml.YAMLError, match="duplicate key 'lists'"):
+        _create_intents(
+            model, settings, Things(), _get_custom_sentences_paths(model, settings)
+        )
+
+
+def test_cached_intents(tmp_path: Path) -> None:
+    """Test that intents are only loaded from cache with the same key."""
+    cache_path = tmp_path / "intents.pkl"
+    assert _load_cached_intents(cache_path, "key") is None
+
+    intents = Intents.from_dict(
+        {
+            "language": "en",
+            "intents": {"TestIntent": {"data": [{"sentences": ["test sentence"]}]}},
+        }
+    )
+    _save_cached_intents(cache_path, "key", intents, "debug: yaml\n")
+
+    cached_intents = _load_cached_intents(cache_path, "key")
+    assert cached_intents is not None
+    assert cached_intents[0].intents.keys() == intents.intents.keys()
+    assert cached_intents[1] == "debug: yaml\n"
+
+    assert _load_cached_intents(cache_path, "other key") is None
+
+    # Corrupt cache is ignored
+    cache_path.write_bytes(b"not a pickle")
+    assert _load_cached_intents(cache_path, "key") is None
+
+
+@pytest.mark.asyncio
+async def test_training_sentences_cached(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that debug YAML is written when intents are loaded from cache."""
+    model = MODELS[Language.ENGLISH.value]
+    settings = _make_settings(tmp_path)
+    settings.sentences = _SENTENCES_DIR
+    settings.model_data_dir(model.id).mkdir(parents=True)
+
+    # Only intents are tested here
+    train_module = importlib.import_module("speech_to_phrase.train")
+
+    async def train_model(*_args, **_kwargs) -> None:
+        pass
+
+    monkeypatch.setattr(train_module, "train_kaldi", train_model)
+    monkeypatch.setattr(train_module, "train_coqui_stt", train_model)
+    monkeypatch.setattr(train_module, "_create_intents_fst", lambda *_args: None)
+
+    await train_module.train(model, settings, Things(), force_retrain=True)
+    training_sentences_path = settings.training_sentences_path(model.id)
+    training_sentences_yaml = training_sentences_path.read_text(encoding="utf-8")
+    assert training_sentences_yaml
+
+    def create_intents(*_args):
+        raise AssertionError("Intents should be cached")
+
+    monkeypatch.setattr(train_module, "_create_intents", create_intents)
+    training_sentences_path.unlink()
+
+    await train_module.train(model, settings, Things(), force_retrain=True)
+    assert (
+        training_sentences_path.read_text(encoding="utf-8") == training_sentences_yaml
+    )
+
+
+def test_intents_cache_key_areas(tmp_path: Path) -> None:
+    """Test that changing only areas changes the intents cache key."""
+    settings = _make_settings(tmp_path)
+    training_info = TrainingInfo(
+        model_version="1.0", sentences_hash="sentences", things_hash="things"
+    )
+
+    # Same things hash, but different areas
+    assert _get_intents_cache_key(
+        settings, Things(areas=[Area(names=["Kitchen"])]), training_info
+    ) != _get_intents_cache_key(
+        settings, Things(areas=[Area(names=["Den"])]), training_info
+    )
+
+
+def test_custom_sentences_paths(tmp_path: Path) -> None:
+    """Test that custom sentences use the language, then the language family."""
+    model = MODELS[Language.ENGLISH.value]
+    settings = _make_settings(tmp_path)
+    custom_dir = settings.custom_sentences_dirs[0]
+
+    # Language family
+    family_dir = custom_dir / model.language_family
+    family_dir.mkdir(parents=True)
+    for file_name in ("b.yaml", "a.yaml", "readme.txt"):
+        (family_dir / file_name).write_text("", encoding="utf-8")
+
+    (family_dir / "dir.yaml").mkdir()
+
+    assert _get_custom_sentences_paths(model, settings) == [
+        family_dir / "a.yaml",
+        family_dir / "b.yaml",
+    ]
+
+    # Language takes precedence
+    language_dir = custom_dir / model.language
+    language_dir.mkdir(parents=True)
+    (language_dir / "c.yaml").write_text("", encoding="utf-8")
+
+    assert _get_custom_sentences_paths(model, settings) == [language_dir / "c.yaml"]
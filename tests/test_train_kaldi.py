@@ -0,0 +1,91 @@
+"""Tests for Kaldi training."""
+
+from pathlib import Path
+
+import pytest
+
+from speech_to_phrase.const import EPS, SIL, SPN, UNK
+from speech_to_phrase.g2p import LexiconDatabase
+from speech_to_phrase.hassil_fst import Fst
+from speech_to_phrase.speech_tools import SpeechTools
+from speech_to_phrase.train_kaldi import _create_lexicon, _get_fuzzy_fst_lines
+
+# Guesses a pronunciation for every word except "nope" (reverse order)
+_PHONETISAURUS_STUB = """#!/bin/sh
+for arg in "$@"; do
+    case "$arg" in
+        --wordlist=*) wordlist="${arg#--wordlist=}" ;;
+    esac
+done
+
+while read -r word; do
+    if [ "$word" = "nope" ]; then
+        echo "$word 0"
+    else
+        echo "$word 1.0 $(echo "$word" | sed 's/./& /g')"
+    fi
+done < "$wordlist" | sort -r
+"""
+
+
+@pytest.mark.asyncio
+async def test_create_lexicon(tmp_path: Path) -> None:
+    """Test known, guessed, and unguessable pronunciations in the lexicon."""
+    fst = Fst()
+    state = fst.next_edge(fst.start, "hello")
+    state = fst.next_edge(state, "zorp")
+    state = fst.next_edge(state, "nope")
+    state = fst.next_edge(state, EPS, "__label:test")
+    fst.accept(state)
+
+    lexicon = LexiconDatabase()
+    lexicon.add("hello", [["h", "ə", "l", "oʊ"]])
+
+    model_dir = tmp_path / "model"
+    (model_dir / "phones").mkdir(parents=True)
+
+    tools = SpeechTools.from_tools_dir(tmp_path / "tools")
+    tools.phonetisaurus_bin.parent.mkdir(parents=True)
+    tools.phonetisaurus_bin.write_text(_PHONETISAURUS_STUB, encoding="utf-8")
+    tools.phonetisaurus_bin.chmod(0o755)
+
+    train_dir = tmp_path / "train"
+    await _create_lexicon(fst, lexicon, model_dir, train_dir, tools)
+
+    lexicon_path = train_dir / "data" / "local" / "dict" / "lexicon.txt"
+    assert lexicon_path.read_text(encoding="utf-8").splitlines() == [
+        "hello h ə l oʊ",
+        # Guesses in phonetisaurus order, SIL if no guess
+        "zorp z o r p",
+        f"nope {SIL}",
+        f"{UNK} {SPN}",
+        f"__label:test {SIL}",
+    ]
+
+    # Only words with a guess
+    missing_words_path = train_dir / "missing_words_dictionary.txt"
+    assert missing_words_path.read_text(encoding="utf-8").splitlines() == [
+        "zorp z o r p"
+    ]
+
+
+def test_fuzzy_fst_lines() -> None:
+    """Test that transitions are copied and every state gets self loops."""
+    fst_text = "0 1 hello hello\n1 2 world world\n\n2\n"
+    fuzzy_lines = "".join(
+        _get_fuzzy_fst_lines(fst_text, ["hello", "world", "<unk>", "__label:test"])
+    ).splitlines()
+
+    # Transitions are copied first
+    assert fuzzy_lines[:3] == ["0 1 hello hello", "1 2 world world", "2"]
+
+    # States are in any order, and meta words can't be skipped
+    assert sorted(fuzzy_lines[3:]) == sorted(
+        line
+        for state in ("0", "1", "2")
+        for line in (
+            f"{state} {state} {EPS} {EPS} 0.0",
+            f"{state} {state} hello {EPS} 1.0",
+            f"{state} {state} world {EPS} 1.0",
+        )
+    )